@@ -4,20 +4,103 @@ Crawler implementation.
 # pylint: disable=too-many-arguments, too-many-instance-attributes, unused-import, undefined-variable
 import datetime
 import json
+import os
 import pathlib
-import random
 import re
-from time import sleep
-from typing import Pattern, Union
+import shutil
+import ssl
+import threading
+from concurrent.futures import as_completed, Executor, ThreadPoolExecutor
+from time import monotonic, sleep
+from typing import Any, Iterator, Optional, Pattern, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 
 from core_utils.article.article import Article
 from core_utils.article.io import to_meta, to_raw
 from core_utils.config_dto import ConfigDTO
 from core_utils.constants import ASSETS_PATH, CRAWLER_CONFIG_PATH
 
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+MAX_CONNECTIONS = 20
+# Requests to one host start at most once per REQUEST_INTERVAL,
+# so with a single target host only about timeout / REQUEST_INTERVAL of them overlap
+REQUEST_INTERVAL = 1.0
+MAX_RETRIES = 3
+
+_SEED_URL_PATTERN = re.compile(r'^https?://(www\.)?21mm\.ru(/|$)')
+
+_next_request_time: dict[str, float] = {}
+_schedule_lock = threading.Lock()
+
+_ARTICLE_META = {
+    'name': ('description',),
+    'property': ('og:title',),
+    'itemprop': ('author', 'dateModified'),
+}
+
+
+def _has_class(attrs: dict[str, Any], class_name: str) -> bool:
+    """
+    Check whether tag attributes contain the given class.
+
+    Args:
+        attrs (dict[str, Any]): Tag attributes
+        class_name (str): Class to look for
+
+    Returns:
+        bool: Whether the class is present
+    """
+    classes = attrs.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return class_name in classes
+
+
+def _is_article_link(name: str, attrs: dict[str, Any]) -> bool:
+    """
+    Check whether a tag of a seed page holds a link to an article.
+
+    Args:
+        name (str): Tag name
+        attrs (dict[str, Any]): Tag attributes
+
+    Returns:
+        bool: Whether the tag should be parsed
+    """
+    return name == 'a' and _has_class(attrs, 'most-popular__text-preview')
+
+
+def _is_article_content(name: str, attrs: dict[str, Any]) -> bool:
+    """
+    Check whether a tag of an article page holds text or meta information.
+
+    Args:
+        name (str): Tag name
+        attrs (dict[str, Any]): Tag attributes
+
+    Returns:
+        bool: Whether the tag should be parsed
+    """
+    if name == 'meta':
+        return any(attrs.get(key) in values for key, values in _ARTICLE_META.items())
+    if name == 'div':
+        return _has_class(attrs, 'detail-text-div')
+    return name == 'a' and _has_class(attrs, 'most-popular__marker')
+
+
+# bs4 calls a name-callable with (name, attrs) while building a tree with parse_only
+_LINK_STRAINER = SoupStrainer(_is_article_link)  # type: ignore[arg-type]
+_ARTICLE_STRAINER = SoupStrainer(_is_article_content)  # type: ignore[arg-type]
+
+_LINK_SELECTOR = soupsieve.compile('a.most-popular__text-preview')
+_TEXT_SELECTOR = soupsieve.compile('div.detail-text-div')
+_TOPIC_SELECTOR = soupsieve.compile('a.most-popular__marker')
+
 
 class IncorrectSeedURLError(Exception):
     """
@@ -62,6 +145,53 @@ class IncorrectVerifyError(Exception):
     """
 
 
+class _SSLContextAdapter(HTTPAdapter):
+    """
+    HTTP adapter that reuses one SSL context for all its connections.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs: Any) -> None:
+        """
+        Initialize an instance of the _SSLContextAdapter class.
+
+        Args:
+            ssl_context (ssl.SSLContext): SSL context to share between connections
+            **kwargs (Any): Options of requests.adapters.HTTPAdapter
+        """
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Create the connection pool manager with the shared SSL context.
+
+        Args:
+            *args (Any): Arguments of requests.adapters.HTTPAdapter.init_poolmanager
+            **kwargs (Any): Options of requests.adapters.HTTPAdapter.init_poolmanager
+        """
+        kwargs['ssl_context'] = self._ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def cert_verify(self, conn: Any, url: str, verify: Union[bool, str],
+                    cert: Union[str, tuple[str, str], None]) -> None:
+        """
+        Keep certificate settings in the shared SSL context.
+
+        Without this, requests points every connection at its CA bundle,
+        and urllib3 reloads the bundle into the context on each new connection.
+
+        Args:
+            conn (Any): Connection pool of urllib3
+            url (str): Site url
+            verify (Union[bool, str]): Whether to verify certificate or path to CA bundle
+            cert (Union[str, tuple[str, str], None]): Client certificate
+        """
+        super().cert_verify(conn, url, verify, cert)
+        conn.cert_reqs = self._ssl_context.verify_mode
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+
 class Config:
     """
     Class for unpacking and validating configurations.
@@ -75,8 +205,8 @@ class Config:
             path_to_config (pathlib.Path): Path to configuration.
         """
         self.path_to_config = path_to_config
-        self._validate_config_content()
         self.config = self._extract_config_content()
+        self._validate_config_content(self.config)
         self._seed_urls = self.config.seed_urls
         self._num_articles = self.config.total_articles
         self._headers = self.config.headers
@@ -84,6 +214,7 @@ class Config:
         self._timeout = self.config.timeout
         self._should_verify_certificate = self.config.should_verify_certificate
         self._headless_mode = self.config.headless_mode
+        self._session = self._create_session()
 
     def _extract_config_content(self) -> ConfigDTO:
         """
@@ -92,18 +223,40 @@ class Config:
         Returns:
             ConfigDTO: Config values
         """
-        with open(self.path_to_config, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
+        config = json.loads(pathlib.Path(self.path_to_config).read_bytes())
         return ConfigDTO(**config)
 
-    def _validate_config_content(self) -> None:
+    def _create_session(self) -> requests.Session:
+        """
+        Create an HTTP session that keeps connections alive between requests.
+
+        Returns:
+            requests.Session: Session with configured headers and connection pool
+        """
+        session = requests.Session()
+        session.headers.update(self._headers)
+        session.verify = self._should_verify_certificate
+        if self._should_verify_certificate:
+            ssl_context = ssl.create_default_context(cafile=requests.certs.where())
+        else:
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        adapter = _SSLContextAdapter(ssl_context, pool_maxsize=MAX_CONNECTIONS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _validate_config_content(self, config: ConfigDTO) -> None:
         """
         Ensure configuration parameters are not corrupt.
+
+        Args:
+            config (ConfigDTO): Config values
         """
-        config = self._extract_config_content()
+        match_seed_url = _SEED_URL_PATTERN.match
         if not (isinstance(config.seed_urls, list)
-                and all(re.match(r'https?://(www)?\.21mm.ru+', seed_url)
+                and all(isinstance(seed_url, str) and match_seed_url(seed_url)
                         for seed_url in config.seed_urls
                         )
                 ):
@@ -186,11 +339,53 @@ class Config:
         """
         return self._headless_mode
 
+    def get_session(self) -> requests.Session:
+        """
+        Retrieve HTTP session to use during requesting.
+
+        Returns:
+            requests.Session: HTTP session
+        """
+        return self._session
+
+
+def _wait_for_host(url: str) -> None:
+    """
+    Keep at least REQUEST_INTERVAL seconds between requests to the same host.
+
+    Args:
+        url (str): Site url
+    """
+    host = urlparse(url).netloc
+    with _schedule_lock:
+        now = monotonic()
+        start = max(now, _next_request_time.get(host, now))
+        _next_request_time[host] = start + REQUEST_INTERVAL
+    sleep(start - now)
+
+
+def _send_request(url: str, config: Config) -> requests.models.Response:
+    """
+    Send a single request once the host is free.
+
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+
+    Returns:
+        requests.models.Response: A response from a request
+    """
+    _wait_for_host(url)
+    return config.get_session().get(url=url, timeout=config.get_timeout())
+
 
 def make_request(url: str, config: Config) -> requests.models.Response:
     """
     Deliver a response from a request with given configuration.
 
+    Timeouts and server errors are retried up to MAX_RETRIES times,
+    each attempt waiting for its turn at the host.
+
     Args:
         url (str): Site url
         config (Config): Configuration
@@ -198,11 +393,33 @@ def make_request(url: str, config: Config) -> requests.models.Response:
     Returns:
         requests.models.Response: A response from a request
     """
-    sleep(random.randrange(3))
-    return requests.get(url=url,
-                        timeout=config.get_timeout(),
-                        headers=config.get_headers(),
-                        verify=config.get_verify_certificate())
+    for _ in range(MAX_RETRIES):
+        try:
+            response = _send_request(url, config)
+        except requests.Timeout:
+            continue
+        if response.status_code < 500:
+            return response
+    return _send_request(url, config)
+
+
+def _fetch_page(url: str, config: Config) -> bytes:
+    """
+    Download a page.
+
+    Args:
+        url (str): Site url
+        config (Config): Configuration
+
+    Returns:
+        bytes: Page content
+
+    Raises:
+        requests.HTTPError: If the response status is not successful
+    """
+    response = make_request(url, config)
+    response.raise_for_status()
+    return response.content
 
 
 class Crawler:
@@ -234,28 +451,64 @@ class Crawler:
             str: Url from HTML
         """
         url = ''
-        links = article_bs.find_all('a', attrs={'class': 'most-popular__text-preview'})
+        links = _LINK_SELECTOR.select(article_bs)
         for link in links:
             url = str(self.url_pattern + link.get('href'))
             if url not in self.urls:
                 break
         return url
 
-    def find_articles(self) -> None:
+    def _fetch_seed(self, seed_url: str) -> Optional[BeautifulSoup]:
         """
-        Find articles.
+        Download and parse a seed page.
+
+        Args:
+            seed_url (str): Seed url
+
+        Returns:
+            Optional[bs4.BeautifulSoup]: Parsed page or None if request failed
         """
-        seed_urls = self.get_search_urls()
+        try:
+            page = _fetch_page(seed_url, self.config)
+        except requests.HTTPError:
+            return None
+        return BeautifulSoup(page, 'lxml',
+                             from_encoding=self.config.get_encoding(),
+                             parse_only=_LINK_STRAINER)
+
+    def iter_article_urls(self, executor: Executor) -> Iterator[str]:
+        """
+        Download seed pages with the given executor and yield article urls as they are found.
 
-        while len(self.urls) < self.config.get_num_articles():
-            for seed_url in seed_urls:
-                response = make_request(seed_url, self.config)
-                if not response.ok:
-                    continue
+        Every yielded url is already appended to the 'urls' field.
 
-                article_bs = BeautifulSoup(response.text, "lxml")
+        Args:
+            executor (concurrent.futures.Executor): Executor to download seed pages with
+
+        Yields:
+            str: Newly found article url
+        """
+        for article_bs in executor.map(self._fetch_seed, self.get_search_urls()):
+            if article_bs is None:
+                continue
+            while len(self.urls) < self.config.get_num_articles():
                 extracted = self._extract_url(article_bs)
+                if not extracted or extracted in self.urls:
+                    break
                 self.urls.append(extracted)
+                yield extracted
+
+    def find_articles(self) -> None:
+        """
+        Find articles.
+        """
+        seed_urls = self.get_search_urls()
+        if not seed_urls:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(seed_urls))) as executor:
+            for _ in self.iter_article_urls(executor):
+                pass
 
     def get_search_urls(self) -> list:
         """
@@ -297,7 +550,7 @@ class HTMLParser:
             article_soup (bs4.BeautifulSoup): BeautifulSoup instance
         """
         description = article_soup.find('meta', attrs={'name': 'description'}).text
-        all_txt = article_soup.find('div', attrs={'class': 'detail-text-div'}).text
+        all_txt = _TEXT_SELECTOR.select_one(article_soup).text
         self.article.text = str(description + all_txt)
 
     def _fill_article_with_meta_information(self, article_soup: BeautifulSoup) -> None:
@@ -319,7 +572,7 @@ class HTMLParser:
         if date:
             self.article.date = self.unify_date_format(date)
 
-        topics = article_soup.find_all('a', class_='most-popular__marker')
+        topics = _TOPIC_SELECTOR.select(article_soup)
         for topic in topics:
             self.article.topics.append(topic.text)
 
@@ -346,11 +599,16 @@ class HTMLParser:
         Returns:
             Union[Article, bool, list]: Article instance
         """
-        response = make_request(self.full_url, self.config)
-        if response.ok:
-            article_bs = BeautifulSoup(response.text, 'lxml')
-            self._fill_article_with_text(article_bs)
-            self._fill_article_with_meta_information(article_bs)
+        try:
+            page = _fetch_page(self.full_url, self.config)
+        except requests.HTTPError:
+            return self.article
+
+        article_bs = BeautifulSoup(page, 'lxml',
+                                   from_encoding=self.config.get_encoding(),
+                                   parse_only=_ARTICLE_STRAINER)
+        self._fill_article_with_text(article_bs)
+        self._fill_article_with_meta_information(article_bs)
 
         return self.article
 
@@ -362,9 +620,10 @@ def prepare_environment(base_path: Union[pathlib.Path, str]) -> None:
     Args:
         base_path (Union[pathlib.Path, str]): Path where articles stores
     """
-    base_path.mkdir(parents=True, exist_ok=True)
-    for file in base_path.iterdir():
-        file.unlink(missing_ok=True)
+    base_path = pathlib.Path(base_path)
+    if base_path.exists():
+        shutil.rmtree(base_path)
+    base_path.mkdir(parents=True)
 
 
 def main() -> None:
@@ -375,15 +634,17 @@ def main() -> None:
     prepare_environment(ASSETS_PATH)
 
     crawler = Crawler(config)
-    crawler.find_articles()
-
-    for index, url in enumerate(crawler.urls, 1):
-        parser = HTMLParser(url, index, config)
-        article = parser.parse()
-        if isinstance(article, Article):
-            to_raw(article)
-            to_meta(article)
-        print('Done')
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(HTMLParser(url, index, config).parse)
+            for index, url in enumerate(crawler.iter_article_urls(executor), 1)
+        ]
+        for future in as_completed(futures):
+            article = future.result()
+            if isinstance(article, Article):
+                to_raw(article)
+                to_meta(article)
+    print('Done')
 
 
 if __name__ == "__main__":